@@ -1,9 +1,14 @@
+import bisect
 import random
+from collections import deque
 from enum import Enum
-from statistics import mean
+from operator import attrgetter
 from typing import List, Dict, Tuple, Union
 
 EMERGENCY_TAKEOUT = "Emergency Takeout"
+# Leftovers put back in the fridge after a meal: both their best before and spoilage dates are this many days out.
+LEFTOVER_NAME = "leftover"
+LEFTOVER_SHELF_LIFE = 2
 
 
 class FoodType(Enum):
@@ -11,8 +16,22 @@ class FoodType(Enum):
     PERISHABLE = "perishable"
     NON_PERISHABLE = "non-perishable"
 
+    # Members are singletons compared by identity, so hash them by identity too: this skips Enum's
+    # Python-level __hash__ on every lookup in the many dicts keyed by FoodType.
+    __hash__ = object.__hash__
+
+
+# Module-level names for the members: reaching them through the FoodType class goes through the Enum machinery,
+# which adds up in the code that runs for every meal of every household.
+_LEFTOVER = FoodType.LEFTOVER
+_PERISHABLE = FoodType.PERISHABLE
+_NON_PERISHABLE = FoodType.NON_PERISHABLE
+
 
 class FoodItem:
+    # A simulation keeps thousands of these alive: slots make each one smaller and its attributes quicker to reach.
+    __slots__ = ('name', 'food_type', 'best_before', 'spoilage_date', 'quantity')
+
     def __init__(self, name: str, food_type: FoodType, best_before: int, spoilage_date: int, quantity: float):
         """
         Initialize a new FoodItem object.
@@ -32,6 +51,22 @@ class FoodItem:
             raise ValueError("Cannot have best before longer than spoilage date")
         self.quantity = quantity
 
+    @classmethod
+    def _unchecked(cls, name: str, food_type: FoodType, best_before: int, spoilage_date: int,
+                   quantity: float) -> "FoodItem":
+        """
+        Build a FoodItem without going through __init__ and its date check.
+
+        Only meant for callers that already guarantee best_before <= spoilage_date.
+        """
+        item = cls.__new__(cls)
+        item.name = name
+        item.food_type = food_type
+        item.best_before = best_before
+        item.spoilage_date = spoilage_date
+        item.quantity = quantity
+        return item
+
     def consume(self, amount: float) -> None:
         """
         Consume a portion of the food item.
@@ -48,13 +83,10 @@ class FoodItem:
 
     def day_passes(self) -> None:
         """
-        Simulate the passing of a day, decrementing the best before and spoilage dates.
+        Simulate the passing of a day, decrementing the best before and spoilage dates (never below 0).
         """
-        if self.best_before > 0:
-            self.best_before -= 1
-
-        if self.spoilage_date > 0:
-            self.spoilage_date -= 1
+        self.best_before = max(self.best_before - 1, 0)
+        self.spoilage_date = max(self.spoilage_date - 1, 0)
 
     def is_past_best_before(self) -> bool:
         """
@@ -107,7 +139,7 @@ class StrictStrategy(PantryStrategy):
         Returns:
         - bool: True if the item is past its best before date, otherwise False.
         """
-        return item.is_past_best_before()
+        return item.best_before <= 0
 
 
 class LaxStrategy(PantryStrategy):
@@ -121,10 +153,14 @@ class LaxStrategy(PantryStrategy):
         Returns:
         - bool: True if the item is expired, otherwise False.
         """
-        return item.is_expired()
+        return item.spoilage_date <= 0
 
 
 class Pantry:
+    # One pantry per household, read and updated on every meal and every day.
+    __slots__ = ('items_by_type', 'waste_log', 'current_day', 'totals_by_type',
+                 'today_expired_total', 'today_strategy_total')
+
     def __init__(self):
         """
               Initialize a new Pantry object.
@@ -141,6 +177,11 @@ class Pantry:
             'expired_discards': {}  ## things that have spoiled...
         }
         self.current_day: int = 0
+        ## running total weight stored for each food type, so that get_total_by_type doesn't walk the items
+        self.totals_by_type: Dict[FoodType, float] = {food_type: 0 for food_type in FoodType}
+        ## weight thrown away on the latest step (all food types together), as expired and by strategy
+        self.today_expired_total: float = 0
+        self.today_strategy_total: float = 0
 
     def add_item(self, item: FoodItem) -> None:
         """
@@ -149,9 +190,52 @@ class Pantry:
         Args:
             item (FoodItem): The food item to be added to the pantry.
         """
-        self.items_by_type[item.food_type].append(item)
-        # Sort by expiration date. Smallest (soonest to expire) first.
-        self.items_by_type[item.food_type].sort(key=lambda x: x.spoilage_date)
+        # Keep the list sorted by expiration date. Smallest (soonest to expire) first.
+        # Inserting in place (after any item expiring the same day) avoids re-sorting the whole list.
+        bisect.insort(self.items_by_type[item.food_type], item, key=attrgetter("spoilage_date"))
+        self.totals_by_type[item.food_type] += item.quantity
+
+    def add_items(self, items: List[FoodItem]) -> None:
+        """
+        Add several food items to the pantry at once (a whole grocery order, say).
+
+        Same result as calling add_item on each of them in turn, but every list that got new items
+        is sorted once at the end instead of searched once per item.
+
+        Args:
+            items (List[FoodItem]): The food items to be added to the pantry.
+        """
+        items_by_type = self.items_by_type
+        totals_by_type = self.totals_by_type
+        touched_types = set()
+        for item in items:
+            items_by_type[item.food_type].append(item)
+            totals_by_type[item.food_type] += item.quantity
+            touched_types.add(item.food_type)
+        # The sort is stable: new items land after anything already there expiring the same day, like insort would.
+        for food_type in touched_types:
+            items_by_type[food_type].sort(key=attrgetter("spoilage_date"))
+
+    def consume_item(self, item: FoodItem, amount: float) -> None:
+        """
+        Consume part of a food item stored in this pantry, keeping the running totals up to date.
+
+        Args:
+            item (FoodItem): The food item, which must be in this pantry.
+            amount (float): The amount to consume in kg.
+
+        Raises:
+            ValueError: If the specified amount to consume is greater than the available quantity.
+        """
+        item.consume(amount)
+        food_type = item.food_type
+        total = self.totals_by_type[food_type] - amount
+        # Subtracting in pick order leaves rounding residue (1e-16, or even slightly negative) that meal planning
+        # would then try to eat. Whenever an item is finished, or the total is down to crumbs (the same 0.001
+        # step uses for finished items), add the items up again instead.
+        if item.quantity <= 0 or total <= 0.001:
+            total = sum(food.quantity for food in self.items_by_type[food_type])
+        self.totals_by_type[food_type] = total
 
     def step(self, strategy: PantryStrategy) -> None:
         """
@@ -159,42 +243,56 @@ class Pantry:
         checks for expired items, and updates the waste log.
         """
         self.current_day += 1
-        # Create two lists: one to track items that have expired, another to track items discarded by the strategy.
-        expired_items = []
-        strategy_discards = []
-        empty_items = []  ## items that we have to throw away because they are finished and are just taking space in the pantry
-        # We'll maintain a dict to track the weight of discarded items by type.
-        weights_expired = {item_type: 0 for item_type in FoodType}
-        weights_strategy_discarded = {item_type: 0 for item_type in FoodType}
-
-        # Call day_passes for each item in the pantry
-        for food_list in self.items_by_type.values():
+        # We'll maintain a dict to track the weight of discarded items by type. These become today's
+        # waste log entries, and the loop below fills in every food type, so there's no need to zero them first.
+        weights_expired = {}
+        weights_strategy_discarded = {}
+        # ... and the same weights over all food types, for the household's daily record.
+        expired_total = 0
+        strategy_total = 0
+
+        # The strategy is the same for every item, so look its method up once rather than once per item.
+        should_discard = strategy.should_discard
+
+        # Call day_passes for each item in the pantry. Each list is rebuilt in a single pass keeping only
+        # the items that survive the day, rather than calling list.remove() once per discarded item.
+        for food_type, food_list in self.items_by_type.items():
+            kept_items = []
+            kept_weight = 0
+            # Every item in this list has the same food type, so the weights are summed locally
+            # and stored in the tracking dicts once per food type.
+            expired_weight = 0
+            strategy_discarded_weight = 0
             for item in food_list:
                 # Decrement the expiration dates (best before and spoilage) of the food item.
                 item.day_passes()
+                ## items that are finished are just taking space in the pantry: drop them without logging
                 if item.quantity <= 0.001:
-                    empty_items.append(item)
-                # Check if the item has passed its spoilage date and is now considered expired.
-                elif item.is_expired():
-                    expired_items.append(item)
-                    # Directly update the weight of the expired item in the tracking dict.
-                    weights_expired[item.food_type] += item.quantity
+                    continue
+                # Check if the item is past its spoilage date, i.e. expired (item.is_expired(), inlined).
+                elif item.spoilage_date <= 0:
+                    expired_weight += item.quantity
                 # If the item isn't expired, use the provided strategy to decide if it should be discarded.
-                elif strategy.should_discard(item):
-                    strategy_discards.append(item)
-                    # Directly update the weight of the strategy discarded item in the tracking dict.
-                    weights_strategy_discarded[item.food_type] += item.quantity
-
+                elif should_discard(item):
+                    strategy_discarded_weight += item.quantity
+                else:
+                    kept_items.append(item)
+                    kept_weight += item.quantity
+            # Slice assignment keeps the same list object (and the spoilage date order) for anyone holding it.
+            food_list[:] = kept_items
+            # Recomputing the total from the survivors also clears any rounding drift from consumption.
+            self.totals_by_type[food_type] = kept_weight
+            weights_expired[food_type] = expired_weight
+            weights_strategy_discarded[food_type] = strategy_discarded_weight
+            expired_total += expired_weight
+            strategy_total += strategy_discarded_weight
+
+        self.today_expired_total = expired_total
+        self.today_strategy_total = strategy_total
         # Now, directly populate the waste_log using the tracking dicts without additional loops.
         self.waste_log['expired_discards'][self.current_day] = weights_expired
         self.waste_log['strategy_discards'][self.current_day] = weights_strategy_discarded
 
-        # Finally, remove all the items (both expired and decided by strategy) from the pantry.
-        # Iterate through each item in the combined list of expired and strategy discarded items.
-        for item in expired_items + strategy_discards + empty_items:
-            # Remove the item from the pantry's items list.
-            self.items_by_type[item.food_type].remove(item)
-
     def get_total_by_type(self, food_type: FoodType) -> float:
         """
         Return the total weight in kg of a specified type of food in the pantry.
@@ -205,7 +303,7 @@ class Pantry:
         Returns:
             float: The total weight in kg of the specified food type in the pantry.
         """
-        return sum(item.quantity for item in self.items_by_type[food_type])
+        return self.totals_by_type[food_type]
 
     def get_waste_log(self) -> Dict[str, Dict[int, Dict[FoodType, float]]]:
         """
@@ -220,7 +318,7 @@ class Pantry:
         return self.items_by_type[food_type]
 
     def get_total(self):
-        return sum(item.quantity for item_list in self.items_by_type.values() for item in item_list)
+        return sum(self.totals_by_type.values())
 
     def reset(self):
         self.items_by_type = {
@@ -228,6 +326,7 @@ class Pantry:
             FoodType.PERISHABLE: [],
             FoodType.NON_PERISHABLE: []
         }
+        self.totals_by_type = {food_type: 0 for food_type in FoodType}
 
 
 class ConsumptionStrategy(ABC):
@@ -241,9 +340,11 @@ class ConsumptionStrategy(ABC):
     """
 
     @abstractmethod
-    def select_food(self, pantry: Pantry, food_type: FoodType, amount: float) -> List[Tuple[FoodItem, float]]:
+    def select_food(self, pantry: Pantry, food_type: FoodType,
+                    amount: float) -> Tuple[List[Tuple[FoodItem, float]], float]:
         """
-        Returns a list of food items (and their respective quantities) to be consumed.
+        Returns a list of food items (and their respective quantities) to be consumed, along with
+        the total weight they add up to.
 
         Args:
             pantry (Pantry): The pantry where we're grabbing our grub from.
@@ -251,8 +352,9 @@ class ConsumptionStrategy(ABC):
             amount (float): How much of this food type, by weight, we're planning to munch on.
 
         Returns:
-            List[Dict[FoodItem, float]]: List of dicts. Each dict has a FoodItem as the key, and
-                                         the weight of that item we're gonna eat as the value.
+            Tuple[List[Tuple[FoodItem, float]], float]: The list of (FoodItem, weight we're gonna eat) pairs,
+                                                        and the total weight picked, so callers
+                                                        don't have to add it up again.
         """
         pass
 
@@ -268,7 +370,8 @@ class BasicConsumptionStrategy(ConsumptionStrategy):
     to us until we eat 500g.
     """
 
-    def select_food(self, pantry: Pantry, food_type: FoodType, amount: float) -> List[Tuple[FoodItem, float]]:
+    def select_food(self, pantry: Pantry, food_type: FoodType,
+                    amount: float) -> Tuple[List[Tuple[FoodItem, float]], float]:
         """
         Selects the food to consume based on the type and the desired amount.
 
@@ -278,9 +381,11 @@ class BasicConsumptionStrategy(ConsumptionStrategy):
             amount (float): The weight of food we're aiming to eat.
 
         Returns:
-            List[Dict[FoodItem, float]]: The list of foods (and amounts) we've selected to eat.
+            Tuple[List[Tuple[FoodItem, float]], float]: The foods (and amounts) we've selected to eat,
+                                                        and how much that is in total.
         """
         foods_to_eat = []
+        consumed_amount = 0
         available_foods = pantry.get_items_by_type(food_type)  # Direct access, thanks to our pantry overhaul!
 
         # We're going down the list of available foods for this type...
@@ -289,23 +394,31 @@ class BasicConsumptionStrategy(ConsumptionStrategy):
             if amount <= 0:
                 break
 
+            quantity = food.quantity
+            # Items finished by an earlier meal stay in the pantry until the next step; nothing to take from them.
+            if quantity <= 0:
+                continue
+
             # If the current food item has less weight than we still need to eat,
             # we eat all of it and adjust the remaining amount we need.
-            if food.quantity <= amount:
-                foods_to_eat.append((food, food.quantity))
-                amount -= food.quantity
+            if quantity <= amount:
+                foods_to_eat.append((food, quantity))
+                consumed_amount += quantity
+                amount -= quantity
             else:
                 # If this item has more weight than we still need,
-                # we eat just a part of it and our target is reached.
+                # we eat just a part of it and our target is reached: no need to look any further.
                 foods_to_eat.append((food, amount))
-                amount = 0
+                consumed_amount += amount
+                break
 
-        return foods_to_eat
+        return foods_to_eat, consumed_amount
 
 
 class RandomConsumptionStrategy(ConsumptionStrategy):
 
-    def select_food(self, pantry: Pantry, food_type: FoodType, amount: float) -> List[Tuple[FoodItem, float]]:
+    def select_food(self, pantry: Pantry, food_type: FoodType,
+                    amount: float) -> Tuple[List[Tuple[FoodItem, float]], float]:
         """
         Randomly select food items from the pantry.
 
@@ -315,33 +428,43 @@ class RandomConsumptionStrategy(ConsumptionStrategy):
             amount (float): The amount of food we wanna eat.
 
         Returns:
-            List[Dict[FoodItem, float]]: List of chosen food items and the quantity to eat.
+            Tuple[List[Tuple[FoodItem, float]], float]: List of chosen food items and the quantity to eat,
+                                                        plus the total quantity.
         """
 
-        # This list will store what we've decided to eat.
+        # This list will store what we've decided to eat, and how much that adds up to.
         foods_to_eat = []
+        consumed_amount = 0
 
         # Get all available food of the desired type.
         available_foods = pantry.get_items_by_type(food_type)
 
+        # The items we haven't picked yet, in pantry order. This is our own copy, leaving out the items finished by
+        # an earlier meal: we never touch the pantry's list, it's the pantry's job to clear those out.
+        candidates = [food for food in available_foods if food.quantity > 0]
+
         # Keep looping till we've eaten enough or run outta options.
-        while amount > 0 and available_foods:
-            # Pick a random item from the list.
-            food = random.choice(available_foods)
+        while amount > 0 and candidates:
+            # Pick a random item among those not picked yet.
+            pick = random.randrange(len(candidates))
+            food = candidates[pick]
 
             # If there's less food than we wanna eat, we eat all of it.
             if food.quantity <= amount:
                 foods_to_eat.append((food, food.quantity))
+                consumed_amount += food.quantity
                 amount -= food.quantity
 
-                # Once chosen, we remove it from the list so we don't double-dip.
-                available_foods.remove(food)
+                # Once chosen, we remove it from the candidates so we don't double-dip.
+                # Popping keeps the others in order, so the same draws pick the same items as random.choice did.
+                candidates.pop(pick)
             else:
                 # If there's more food than we need, we eat just what we want.
                 foods_to_eat.append((food, amount))
+                consumed_amount += amount
                 amount = 0
 
-        return foods_to_eat  # Return the foods we've chosen.
+        return foods_to_eat, consumed_amount  # Return the foods we've chosen.
 
 
 class MixedConsumptionStrategy(ConsumptionStrategy):
@@ -361,7 +484,8 @@ class MixedConsumptionStrategy(ConsumptionStrategy):
         self.basic_strategy = BasicConsumptionStrategy()
         self.random_strategy = RandomConsumptionStrategy()
 
-    def select_food(self, pantry: Pantry, food_type: FoodType, amount: float) -> List[Tuple[FoodItem, float]]:
+    def select_food(self, pantry: Pantry, food_type: FoodType,
+                    amount: float) -> Tuple[List[Tuple[FoodItem, float]], float]:
         """
         Select food either randomly or by FIFO based on set probability.
 
@@ -371,7 +495,8 @@ class MixedConsumptionStrategy(ConsumptionStrategy):
             amount (float): How much food we're lookin' to scarf down.
 
         Returns:
-            List[Dict[FoodItem, float]]: List of selected foods and the amount we're gonna eat.
+            Tuple[List[Tuple[FoodItem, float]], float]: List of selected foods and the amount we're gonna eat,
+                                                        plus the total.
         """
 
         # Roll the dice. If we're under our FIFO prob, we go FIFO.
@@ -383,6 +508,7 @@ class MixedConsumptionStrategy(ConsumptionStrategy):
 
 
 class Meal:
+    __slots__ = ('pantry', 'consumption_patterns')
 
     def __init__(self, pantry: Pantry):
         self.pantry = pantry
@@ -401,22 +527,32 @@ class Meal:
         self.consumption_patterns = patterns
         return patterns
 
-    def choose_food_to_eat(self,
-                           consumption_strategy) -> List[Tuple[FoodItem, float]]:
-        foods_to_eat = []
-
+    def _select_foods(self, consumption_strategy):
+        """
+        Go through the consumption pattern one food type at a time, yielding the pantry items the strategy
+        picked for it and the emergency takeout covering whatever the pantry couldn't (None if nothing is missing).
+        """
         for food_type, amount in self.consumption_patterns.items():
-            chosen_foods = consumption_strategy.select_food(self.pantry, food_type, amount)
-            foods_to_eat.extend(chosen_foods)
+            chosen_foods, consumed_amount = consumption_strategy.select_food(self.pantry, food_type, amount)
 
             # The amount left to consume can be computed as the difference
             # between the desired amount and the amount actually consumed.
-            consumed_amount = sum([d[1] for d in chosen_foods])
             remaining_amount = amount - consumed_amount
 
+            takeout = None
             if remaining_amount > 0:
-                foods_to_eat.append(
-                    (FoodItem(EMERGENCY_TAKEOUT, FoodType.PERISHABLE, 0, 0, remaining_amount), remaining_amount))
+                takeout = (FoodItem(EMERGENCY_TAKEOUT, _PERISHABLE, 0, 0, remaining_amount), remaining_amount)
+
+            yield chosen_foods, takeout
+
+    def choose_food_to_eat(self,
+                           consumption_strategy) -> List[Tuple[FoodItem, float]]:
+        foods_to_eat = []
+
+        for chosen_foods, takeout in self._select_foods(consumption_strategy):
+            foods_to_eat.extend(chosen_foods)
+            if takeout is not None:
+                foods_to_eat.append(takeout)
 
         return foods_to_eat
 
@@ -425,23 +561,26 @@ class Meal:
         """
         Decide on the food to eat and then actually consume it.
 
-        So here's the drill. First, we're gonna pick out what we wanna eat using that
-        fancy `choose_food_to_eat()` method. Once we've decided on the menu, we dig in and
-        update the quantities in the pantry. Remember, if we're still hungry and there's
+        So here's the drill. We go through the same picks as the
+        fancy `choose_food_to_eat()` method, but we dig in and update the quantities in
+        the pantry as soon as each food type is decided. Remember, if we're still hungry and there's
         not enough in the pantry, we're gonna have some of that "Emergency Takeout".
 
         Returns:
             List[Dict[FoodItem, float]]:: A list of the food items we consumed.
         """
 
-        foods_to_eat = self.choose_food_to_eat(consumption_strategy)  # Picking out our food
-        consumed_foods = []
+        foods_to_eat = []
+        consume_item = self.pantry.consume_item
 
-        for food_choice in foods_to_eat:
-            # If it's an "Emergency Takeout", we don't have to update the pantry.
-            if food_choice[0].name != "Emergency Takeout":
-                food_choice[0].consume(food_choice[1])  # Digging in!
-            consumed_foods.append((food_choice[0], food_choice[1]))
+        for chosen_foods, takeout in self._select_foods(consumption_strategy):  # Picking out our food
+            for food, amount in chosen_foods:
+                consume_item(food, amount)  # Digging in!
+            foods_to_eat.extend(chosen_foods)
+
+            # The "Emergency Takeout" doesn't come from the pantry, so there's nothing to update there.
+            if takeout is not None:
+                foods_to_eat.append(takeout)
 
         return foods_to_eat
 
@@ -453,6 +592,7 @@ class PlannedMeal:
     This doesn't decide the actual items that will be eaten but gives an overview of total grams
     of food that should be consumed for the meal.
     """
+    __slots__ = ('total_grams',)
 
     def __init__(self, total_grams: float):
         """
@@ -504,19 +644,15 @@ class StandardMealGenerator(MealGenerator):
 
         consumption_patterns = self._calculate_daily_consumption(household)
 
+        # For this basic generator, we'll assume the household consumes the same amount every day.
+        # But you could randomize this or make it more complex if needed.
+        meals_of_the_day = [consumption_patterns[meal_name] for meal_name in ["breakfast", "lunch", "dinner"]]
+        meals_at_home_ratio = self.meals_at_home_ratio
+        draw = random.random
         for _ in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-            day_meals = []
-
-            # Calculate total consumption for the day, divided by meal type
-
-            # For this basic generator, we'll assume the household consumes the same amount every day.
-            # But you could randomize this or make it more complex if needed.
-            for meal_name in ["breakfast", "lunch", "dinner"]:
-                if random.random() <= self.meals_at_home_ratio:  # Only create meals that are eaten at home
-                    meal = PlannedMeal(consumption_patterns[meal_name])
-                    day_meals.append(meal)
-
-            weekly_meals.append(day_meals)
+            # Only create meals that are eaten at home (one draw per meal, in breakfast/lunch/dinner order)
+            weekly_meals.append([PlannedMeal(meal_pattern) for meal_pattern in meals_of_the_day
+                                 if draw() <= meals_at_home_ratio])
 
         return weekly_meals
 
@@ -567,23 +703,33 @@ class VariableMealGenerator(MealGenerator):
     def generate_weekly_meals(self, household: 'Household') -> List[List[PlannedMeal]]:
         weekly_meals = self.base_generator.generate_weekly_meals(household)
 
+        # These are the same for every meal of the week, so look them up once.
+        guest_probability = self.guest_probability
+        max_guests = self.max_guests
+        noise_std = self.noise_std
+        # Assuming guests eat the same amount as an adult for simplicity
+        # they always eat for lunch...
+        grams_per_guest = self.ADULT_CONSUMPTION["lunch"]
+        # Bound per call, so they can still be mocked.
+        uniform_draw = random.random
+        randint = random.randint
+        gauss = random.gauss
+
         for day_meals in weekly_meals:
             for meal in day_meals:
+                total_grams = meal.total_grams
 
                 # Add guest consumption
-                if random.random() < self.guest_probability:
-                    num_guests = random.randint(1, self.max_guests)
-                    # Assuming guests eat the same amount as an adult for simplicity
-                    # they always eat for lunch...
-                    guest_consumption = num_guests * self.ADULT_CONSUMPTION["lunch"]
-                    meal.total_grams += guest_consumption
+                if uniform_draw() < guest_probability:
+                    num_guests = randint(1, max_guests)
+                    total_grams += num_guests * grams_per_guest
 
                 # Add normally distributed noise to consumption
-                noise = 1 + random.gauss(0, self.noise_std)
-                meal.total_grams *= noise
+                noise = 1 + gauss(0, noise_std)
+                total_grams *= noise
 
                 # Ensure consumption doesn't go negative due to noise
-                meal.total_grams = int(max(0, meal.total_grams))
+                meal.total_grams = int(max(0, total_grams))
 
         return weekly_meals
 
@@ -617,8 +763,8 @@ class FreshFirstStrategy(MealPlanningStrategy):
         # Calculate the amount of each food type based on priority: leftovers, perishables, non-perishables.
         total_grams = planned_meal.total_grams
 
-        leftovers = pantry.get_total_by_type(FoodType.LEFTOVER)
-        perishables = pantry.get_total_by_type(FoodType.PERISHABLE)
+        leftovers = pantry.get_total_by_type(_LEFTOVER)
+        perishables = pantry.get_total_by_type(_PERISHABLE)
 
         leftovers_to_consume = min(leftovers, total_grams)
         total_grams -= leftovers_to_consume
@@ -629,9 +775,9 @@ class FreshFirstStrategy(MealPlanningStrategy):
         non_perishables_to_consume = total_grams
 
         consumption_patterns = {
-            FoodType.LEFTOVER: leftovers_to_consume,
-            FoodType.PERISHABLE: perishables_to_consume,
-            FoodType.NON_PERISHABLE: non_perishables_to_consume
+            _LEFTOVER: leftovers_to_consume,
+            _PERISHABLE: perishables_to_consume,
+            _NON_PERISHABLE: non_perishables_to_consume
         }
 
         meal.set_consumption_patterns(consumption_patterns)
@@ -648,8 +794,8 @@ class ProportionalConsumptionStrategy(MealPlanningStrategy):
 
         total_grams = planned_meal.total_grams
 
-        leftovers_available = pantry.get_total_by_type(FoodType.LEFTOVER)
-        perishables_available = pantry.get_total_by_type(FoodType.PERISHABLE)
+        leftovers_available = pantry.get_total_by_type(_LEFTOVER)
+        perishables_available = pantry.get_total_by_type(_PERISHABLE)
 
         leftovers_to_consume = min(leftovers_available, total_grams)
         total_grams -= leftovers_to_consume
@@ -668,9 +814,9 @@ class ProportionalConsumptionStrategy(MealPlanningStrategy):
             non_perishables_to_consume += to_transfer
 
         consumption_patterns = {
-            FoodType.LEFTOVER: leftovers_to_consume,
-            FoodType.PERISHABLE: perishables_to_consume,
-            FoodType.NON_PERISHABLE: non_perishables_to_consume
+            _LEFTOVER: leftovers_to_consume,
+            _PERISHABLE: perishables_to_consume,
+            _NON_PERISHABLE: non_perishables_to_consume
         }
 
         meal.set_consumption_patterns(consumption_patterns)
@@ -711,27 +857,51 @@ class GroceryStore:
         remaining_quantity = int(total_quantity)
         best_before_mean, best_before_std_dev = self.best_before_params[food_type]
         spoilage_date_mean, spoilage_date_std_dev = self.spoilage_date_params[food_type]
+        # Everything below is the same for every item in the order, so compute it once up front.
+        food_name = food_type.name + " - item"
+        min_quantity = 0.1 * total_quantity
+        max_quantity = 0.5 * total_quantity
+        # Dates go through _draw_from_distribution so subclasses can change how they are drawn.
+        draw_from_distribution = self._draw_from_distribution
+        uniform = random.uniform
         failures = 0
         while remaining_quantity > 0 and failures < 100:
-            food_name = food_type.name + " - item"
-            best_before = self._draw_from_distribution(best_before_mean, best_before_std_dev)
-            spoilage_date = self._draw_from_distribution(spoilage_date_mean, spoilage_date_std_dev)
+            # Dates are drawn from a discrete normal distribution.
+            best_before = draw_from_distribution(best_before_mean, best_before_std_dev)
+            spoilage_date = draw_from_distribution(spoilage_date_mean, spoilage_date_std_dev)
             # Making sure the spoilage date is always greater than the best before date.
             spoilage_date = max(best_before + 1, spoilage_date)
             # To simulate variable quantities of different items, we'll randomly determine the quantity for this item.
-            quantity = min(random.uniform(0.1 * total_quantity, 0.5 * total_quantity), remaining_quantity)
+            quantity = min(uniform(min_quantity, max_quantity), remaining_quantity)
             quantity = int(quantity)
             if quantity == 0:  ## when numbers are really small, you can start missing some orders. Keep them at 0 then....
                 failures += 1
             else:
-                item = FoodItem(food_name, food_type, best_before, spoilage_date, quantity)
-                order.append(item)
+                # The spoilage date was just pushed past the best before date, no need to check it again.
+                order.append(FoodItem._unchecked(food_name, food_type, best_before, spoilage_date, quantity))
 
                 remaining_quantity -= quantity
 
         return order
 
 
+def _order_up_to(pantry: 'Pantry', daily_consumption_perishable: float, daily_consumption_non_perishable: float,
+                 frequency: int, safety_stock_perishable: float,
+                 safety_stock_non_perishable: float) -> Tuple[float, float]:
+    """
+    Order enough to cover the daily consumption until the next order plus the safety stock,
+    net of what is already in the pantry (never a negative order).
+
+    Returns:
+        Tuple[float, float]: The quantity of perishables and non-perishables to order, respectively.
+    """
+    order_quantity_perishable = (daily_consumption_perishable * frequency + safety_stock_perishable
+                                 - pantry.get_total_by_type(_PERISHABLE))
+    order_quantity_non_perishable = (daily_consumption_non_perishable * frequency + safety_stock_non_perishable
+                                     - pantry.get_total_by_type(_NON_PERISHABLE))
+    return max(0, order_quantity_perishable), max(0, order_quantity_non_perishable)
+
+
 class OrderPolicy(ABC):
     """
     Abstract base class for defining how a household determines the quantity to order.
@@ -806,15 +976,9 @@ class FixedConsumptionPolicy(OrderPolicy):
         Returns:
             Tuple[float, float]: The quantity of perishables and non-perishables to order, respectively.
         """
-        order_quantity_perishable = (self.daily_consumption_perishable * self.frequency) + self.safety_stock_perishable
-        order_quantity_non_perishable = (
-                                                    self.daily_consumption_non_perishable * self.frequency) + self.safety_stock_non_perishable
-
         # Adjusting for items already in pantry
-        order_quantity_perishable -= household.pantry.get_total_by_type(FoodType.PERISHABLE)
-        order_quantity_non_perishable -= household.pantry.get_total_by_type(FoodType.NON_PERISHABLE)
-
-        return max(0, order_quantity_perishable), max(0, order_quantity_non_perishable)
+        return _order_up_to(household.pantry, self.daily_consumption_perishable, self.daily_consumption_non_perishable,
+                            self.frequency, self.safety_stock_perishable, self.safety_stock_non_perishable)
 
 
 class HistoricalConsumptionPolicy(FixedConsumptionPolicy):
@@ -844,10 +1008,12 @@ class HistoricalConsumptionPolicy(FixedConsumptionPolicy):
         # If there's less than 7 days of history, just use the base policy
         if len(household.history) < 7:
             return self.base_policy.determine_order_quantity(household)
-        last_week_consumption_perishable = mean(
-            [day["daily_consumption"][FoodType.PERISHABLE] for day in household.history[-7:]])
-        last_week_consumption_non_perishable = mean(
-            [day["daily_consumption"][FoodType.NON_PERISHABLE] for day in household.history[-7:]])
+        # Plain float averages: statistics.mean's exact fraction arithmetic is far slower and buys nothing here
+        last_week = household.history[-7:]
+        last_week_consumption_perishable = sum(
+            day["daily_consumption"][_PERISHABLE] for day in last_week) / 7
+        last_week_consumption_non_perishable = sum(
+            day["daily_consumption"][_NON_PERISHABLE] for day in last_week) / 7
 
         self.base_policy.daily_consumption_perishable = last_week_consumption_perishable
         self.base_policy.daily_consumption_non_perishable = last_week_consumption_non_perishable
@@ -878,18 +1044,18 @@ class AdaptiveOrderPolicy(FixedConsumptionPolicy):
         )
         self.delta = delta
 
-    def _calculate_std_dev(self, data: list) -> float:
+    def _calculate_mean_and_std_dev(self, data: list) -> Tuple[float, float]:
         """
-        Compute the standard deviation for a given list of data.
+        Compute the mean and the (sample) standard deviation for a given list of data, sharing the sum.
         """
         n = len(data)
+        mean_val = sum(data) / n
         if n <= 1:
-            return 0
+            return mean_val, 0
 
-        mean_val = sum(data) / n
         variance = sum((x - mean_val) ** 2 for x in data) / (n - 1)
         std_dev = variance ** 0.5
-        return std_dev
+        return mean_val, std_dev
 
     def determine_order_quantity(self, household: 'Household') -> Tuple[float, float]:
         """
@@ -905,27 +1071,25 @@ class AdaptiveOrderPolicy(FixedConsumptionPolicy):
         if len(household.history) < 7:
             return super().determine_order_quantity(household)
 
-        # Calculate weekly averages
-        last_week_consumption_perishable = sum(
-            [day["daily_consumption"][FoodType.PERISHABLE] for day in household.history[-7:]]) / 7
-        last_week_consumption_non_perishable = sum(
-            [day["daily_consumption"][FoodType.NON_PERISHABLE] for day in household.history[-7:]]) / 7
+        # Pull last week's consumption out of the history once, then get its weekly averages and standard deviations
+        last_week = household.history[-7:]
+        last_week_consumption_perishable, std_dev_perishable = self._calculate_mean_and_std_dev(
+            [day["daily_consumption"][_PERISHABLE] for day in last_week])
+        last_week_consumption_non_perishable, std_dev_non_perishable = self._calculate_mean_and_std_dev(
+            [day["daily_consumption"][_NON_PERISHABLE] for day in last_week])
 
-        # Calculate weekly standard deviations
-        std_dev_perishable = self._calculate_std_dev(
-            [day["daily_consumption"][FoodType.PERISHABLE] for day in household.history[-7:]])
-        std_dev_non_perishable = self._calculate_std_dev(
-            [day["daily_consumption"][FoodType.NON_PERISHABLE] for day in household.history[-7:]])
+        safety_stock_perishable = self.delta * std_dev_perishable
+        safety_stock_non_perishable = self.delta * std_dev_non_perishable
 
-        # Update daily consumption rates
+        # Keep the updated daily consumption rates and safety stocks around (they are what the order was based on)
         self.daily_consumption_perishable = last_week_consumption_perishable
         self.daily_consumption_non_perishable = last_week_consumption_non_perishable
+        self.safety_stock_perishable = safety_stock_perishable
+        self.safety_stock_non_perishable = safety_stock_non_perishable
 
-        # Update safety stocks
-        self.safety_stock_perishable = self.delta * std_dev_perishable
-        self.safety_stock_non_perishable = self.delta * std_dev_non_perishable
-
-        return super().determine_order_quantity(household)
+        # Same order-up-to arithmetic as the fixed policy, done here on the values at hand
+        return _order_up_to(household.pantry, last_week_consumption_perishable, last_week_consumption_non_perishable,
+                            self.frequency, safety_stock_perishable, safety_stock_non_perishable)
 
 
 class PlateWasteCalculator(ABC):
@@ -950,11 +1114,8 @@ class FixedPercentageWasteCalculator(PlateWasteCalculator):
         self.waste_percentage = waste_percentage
 
     def compute_plate_waste(self, consumed_items: List[Tuple[FoodItem, float]]) -> List[Tuple[FoodItem, float]]:
-        wasted_items = []
-        for food_item, amount in consumed_items:
-            wasted_amount = amount * self.waste_percentage
-            wasted_items.append((food_item, wasted_amount))
-        return wasted_items
+        waste_percentage = self.waste_percentage
+        return [(food_item, amount * waste_percentage) for food_item, amount in consumed_items]
 
 
 class LeftoversCalculator(ABC):
@@ -982,10 +1143,11 @@ class PerishableLeftoversGenerator(LeftoversCalculator):
 
     def compute_leftovers(self, consumed_items: List[Tuple[FoodItem, float]],
                           plate_waste: List[Tuple[FoodItem, float]]) -> Dict[FoodType, float]:
-        leftovers = {FoodType.LEFTOVER: 0, FoodType.PERISHABLE: 0, FoodType.NON_PERISHABLE: 0}
-        for food_item, amount in consumed_items:
-            if food_item.food_type == FoodType.PERISHABLE:
-                leftovers[FoodType.LEFTOVER] += amount * self.leftover_percentage
+        leftovers = {_LEFTOVER: 0, _PERISHABLE: 0, _NON_PERISHABLE: 0}
+        # The percentage is the same for every item: add up the perishables first and apply it once.
+        leftovers[_LEFTOVER] = sum(
+            amount for food_item, amount in consumed_items if food_item.food_type is _PERISHABLE
+        ) * self.leftover_percentage
         return leftovers
 
 
@@ -1017,13 +1179,18 @@ class FixedPercentageLeftoverGenerator(LeftoversGenerator):
 
     def compute_leftovers(self, consumed_items: List[Tuple[FoodItem, float]],
                           plate_waste: List[Tuple[FoodItem, float]]) -> float:
-        leftovers = 0
-        for food_item, amount in consumed_items:
-                leftovers += amount * self.leftover_percentage
-        return leftovers
+        # The percentage is the same for every item: add up what was eaten first and apply it once.
+        return sum(amount for _, amount in consumed_items) * self.leftover_percentage
 
 
 class Household:
+    # Every attribute a household ever gets, including the ones set by start_of_week and daily_step.
+    __slots__ = ('adults', 'children', 'income_percentile', 'pantry', 'history',
+                 'meal_planning_strategy', 'meal_generator', 'consumption_strategy', 'pantry_strategy',
+                 'leftover_generator', 'plate_waste_generator', 'order_policy', 'grocery_store',
+                 'weekly_meals', 'meals_eaten_today', 'daily_consumption', 'daily_emergency_takeouts',
+                 'daily_plate_waste', 'daily_leftovers_generated')
+
     def __init__(self, adults: int, children: int, income_percentile: float,
                  meal_generator: MealGenerator = StandardMealGenerator(0.5),
                  meal_planning_strategy: MealPlanningStrategy = FreshFirstStrategy(),
@@ -1097,7 +1264,8 @@ class Household:
         This includes generating the weekly meal plans using the household's meal generator.
         Orders, restocking, or other operations could also be added here in the future.
         """
-        self.weekly_meals = self.meal_generator.generate_weekly_meals(self)
+        # Days are taken off the front of the week, which a deque does without shifting the rest.
+        self.weekly_meals = deque(self.meal_generator.generate_weekly_meals(self))
 
     def daily_step(self) -> Dict[str, Union[int, Dict[FoodType, float]]]:
         """
@@ -1111,39 +1279,52 @@ class Household:
         """
 
         ## reset meal list
-        self.meals_eaten_today = 0
-        self.daily_consumption = {
-            FoodType.LEFTOVER: 0,
-            FoodType.PERISHABLE: 0,
-            FoodType.NON_PERISHABLE: 0
+        # The day's tallies are kept in locals while eating and stored on the household once the meals are done.
+        meals_eaten_today = 0
+        daily_consumption = {
+            _LEFTOVER: 0,
+            _PERISHABLE: 0,
+            _NON_PERISHABLE: 0
         }
-        self.daily_emergency_takeouts = 0
-        self.daily_plate_waste = 0
-        self.daily_leftovers_generated = 0
-
-        meals_today = self.weekly_meals.pop(0)
+        daily_emergency_takeouts = 0
+        daily_plate_waste = 0
+        daily_leftovers_generated = 0
+
+        # Look up the strategies' methods once for the whole day rather than once per meal.
+        pantry = self.pantry
+        consumption_strategy = self.consumption_strategy
+        plan_meal = self.meal_planning_strategy.plan_meal
+        compute_plate_waste = self.plate_waste_generator.compute_plate_waste
+        compute_leftovers = self.leftover_generator.compute_leftovers
+
+        meals_today = self.weekly_meals.popleft()
         for planned_meal in meals_today:
-            actual_meal = self.meal_planning_strategy.plan_meal(planned_meal, self, self.pantry)
-            consumption = actual_meal.consume(self.consumption_strategy)
+            actual_meal = plan_meal(planned_meal, self, pantry)
+            consumption = actual_meal.consume(consumption_strategy)
 
-            self.meals_eaten_today += 1
+            meals_eaten_today += 1
 
             ## some of the consumption will be leftovers and waste....
             ## plate waste...
-            plate_waste = self.plate_waste_generator.compute_plate_waste(consumption)
-            for wasted in plate_waste:
-                self.daily_plate_waste += wasted[1]
+            plate_waste = compute_plate_waste(consumption)
+            daily_plate_waste += sum(wasted for _, wasted in plate_waste)
             ## leftovers....
-            leftovers_here = self.leftover_generator.compute_leftovers(consumption, plate_waste)
+            leftovers_here = compute_leftovers(consumption, plate_waste)
             ## put the leftovers in the fridge
             if leftovers_here>0:
-                self.pantry.add_item(FoodItem("leftover",FoodType.LEFTOVER,
-                                          2,2,leftovers_here))
-                self.daily_leftovers_generated+=leftovers_here
+                pantry.add_item(FoodItem._unchecked(LEFTOVER_NAME, _LEFTOVER,
+                                                    LEFTOVER_SHELF_LIFE, LEFTOVER_SHELF_LIFE, leftovers_here))
+                daily_leftovers_generated += leftovers_here
             for food_item, amount in consumption:
-                self.daily_consumption[food_item.food_type] += amount
+                daily_consumption[food_item.food_type] += amount
                 if food_item.name == EMERGENCY_TAKEOUT:
-                    self.daily_emergency_takeouts += amount
+                    daily_emergency_takeouts += amount
+
+        self.meals_eaten_today = meals_eaten_today
+        self.daily_consumption = daily_consumption
+        self.daily_emergency_takeouts = daily_emergency_takeouts
+        self.daily_plate_waste = daily_plate_waste
+        self.daily_leftovers_generated = daily_leftovers_generated
 
         ### expire stuff.....
         self.pantry.step(self.pantry_strategy)
@@ -1159,16 +1340,14 @@ class Household:
             perishable_quantity, non_perishable_quantity = self.order_policy.determine_order_quantity(self)
 
             # Order from the grocery store.
-            perishable_order = self.grocery_store.get_order(FoodType.PERISHABLE, perishable_quantity)
-            non_perishable_order = self.grocery_store.get_order(FoodType.NON_PERISHABLE, non_perishable_quantity)
+            perishable_order = self.grocery_store.get_order(_PERISHABLE, perishable_quantity)
+            non_perishable_order = self.grocery_store.get_order(_NON_PERISHABLE, non_perishable_quantity)
 
             # Add ordered items to the pantry.
-            for item in perishable_order:
-                total_perishable_bought += item.quantity
-                self.pantry.add_item(item)
-            for item in non_perishable_order:
-                self.pantry.add_item(item)
-                total_nonperishable_bought += item.quantity
+            total_perishable_bought = sum(item.quantity for item in perishable_order)
+            total_nonperishable_bought = sum(item.quantity for item in non_perishable_order)
+            self.pantry.add_items(perishable_order)
+            self.pantry.add_items(non_perishable_order)
 
             # Reset the days until next order.
             self.order_policy.reset_days_until_next_order()
@@ -1179,14 +1358,12 @@ class Household:
             "emergency_takeouts": self.daily_emergency_takeouts,
             "total_perishable_bought": total_perishable_bought,
             "total_nonperishable_bought": total_nonperishable_bought,
-            "expired_discards": sum(
-                value for value in self.pantry.waste_log['expired_discards'][self.pantry.current_day].values()),
-            "strategy_discards": sum(
-                value for value in self.pantry.waste_log['strategy_discards'][self.pantry.current_day].values()),
+            "expired_discards": self.pantry.today_expired_total,
+            "strategy_discards": self.pantry.today_strategy_total,
             "total_food_stored": self.pantry.get_total(),
-            "perishables_stored": self.pantry.get_total_by_type(FoodType.PERISHABLE),
-            "non_perishables_stored": self.pantry.get_total_by_type(FoodType.NON_PERISHABLE),
-            "leftovers_stored": self.pantry.get_total_by_type(FoodType.LEFTOVER),
+            "perishables_stored": self.pantry.get_total_by_type(_PERISHABLE),
+            "non_perishables_stored": self.pantry.get_total_by_type(_NON_PERISHABLE),
+            "leftovers_stored": self.pantry.get_total_by_type(_LEFTOVER),
             "daily_plate_waste": self.daily_plate_waste,
             "daily_leftovers_generated": self.daily_leftovers_generated
         }
@@ -1,6 +1,102 @@
 from simulation import *
+import csv
 import os
-import pandas as pd
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+def history_columns(histories):
+    """
+    Flatten the daily histories of many households into columns, ready to become a DataFrame.
+
+    There is one row per household per simulated day, prefixed with household_number and simulated_day;
+    daily_consumption is split into one column per food type and every other daily record entry keeps its own column.
+
+    Args:
+        histories: the households' histories (household.history), household_number being the position in this list.
+
+    Returns:
+        Dict[str, list]: column name -> values, in the same order as the rows.
+    """
+    columns = {
+        'household_number': [],
+        'simulated_day': [],
+        'daily_consumption_leftover': [],
+        'daily_consumption_perishable': [],
+        'daily_consumption_non_perishable': [],
+    }
+    for idx, history in enumerate(histories):
+        columns['household_number'].extend([idx] * len(history))
+        columns['simulated_day'].extend(range(len(history)))
+        consumption = [daily_record['daily_consumption'] for daily_record in history]
+        columns['daily_consumption_leftover'].extend([day[FoodType.LEFTOVER] for day in consumption])
+        columns['daily_consumption_perishable'].extend([day[FoodType.PERISHABLE] for day in consumption])
+        columns['daily_consumption_non_perishable'].extend([day[FoodType.NON_PERISHABLE] for day in consumption])
+        if history:
+            # daily_consumption has been split above; everything else is copied as it is
+            for key in history[0]:
+                if key != 'daily_consumption':
+                    columns.setdefault(key, []).extend([daily_record[key] for daily_record in history])
+    return columns
+
+
+## narrower types for the columns we know, used when saving to a typed format (days and households are small counts;
+## weights fit comfortably in 32-bit floats). Emergency takeouts are grams, not a count: they stay floats.
+RESULT_DTYPES = {
+    'household_number': 'int32',
+    'simulated_day': 'int16',
+    'meals_eaten_today': 'int8',
+    'daily_consumption_leftover': 'float32',
+    'daily_consumption_perishable': 'float32',
+    'daily_consumption_non_perishable': 'float32',
+    'emergency_takeouts': 'float32',
+    'total_perishable_bought': 'float32',
+    'total_nonperishable_bought': 'float32',
+    'expired_discards': 'float32',
+    'strategy_discards': 'float32',
+    'total_food_stored': 'float32',
+    'perishables_stored': 'float32',
+    'non_perishables_stored': 'float32',
+    'leftovers_stored': 'float32',
+    'daily_plate_waste': 'float32',
+    'daily_leftovers_generated': 'float32',
+}
+
+
+def write_columns_to_csv(where_to_save_results, columns):
+    """
+    Write columns (as built by history_columns) to a CSV file, one row at a time: no DataFrame in between.
+    """
+    # Output matches what DataFrame.to_csv wrote: \n line endings, and a column holding any float is a float column,
+    # so its whole numbers are written as 0.0, 1600.0 rather than 0, 1600.
+    values_by_column = [_as_float_column(values) if any(isinstance(value, float) for value in values) else values
+                        for values in columns.values()]
+    # A 1 MiB buffer: the file goes out in large blocks rather than a small write every few rows.
+    with open(where_to_save_results, 'w', newline='', buffering=1 << 20) as csv_file:
+        writer = csv.writer(csv_file, lineterminator='\n')
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*values_by_column))
+
+
+def _as_float_column(values):
+    """Turn the plain ints of a float column into floats; anything else (bools, strings) is left as it is."""
+    return [float(value) if type(value) is int else value for value in values]
+
+
+def write_columns(where_to_save_results, columns):
+    """
+    Save columns (as built by history_columns) in the format given by the file extension:
+    '.parquet' for a zstd-compressed Parquet file with the narrower RESULT_DTYPES (needs pandas and pyarrow),
+    CSV for anything else.
+    """
+    if where_to_save_results.endswith('.parquet'):
+        import pandas as pd
+        df = pd.DataFrame(columns)
+        df = df.astype({column: dtype for column, dtype in RESULT_DTYPES.items() if column in df.columns})
+        df.to_parquet(where_to_save_results, compression='zstd', index=False)
+    else:
+        write_columns_to_csv(where_to_save_results, columns)
+
 
 def run_simulation(where_to_save_results,
                    frequency_grocery_store=7,
@@ -10,8 +106,13 @@ def run_simulation(where_to_save_results,
                    grocery_store_improvements = 0,
                    meal_generator = StandardMealGenerator(1.0),
                    leftover_generator = FixedPercentageLeftoverGenerator(0),
-                   plate_waste_generator = FixedPercentageWasteCalculator(0)
+                   plate_waste_generator = FixedPercentageWasteCalculator(0),
+                   seed=None
                    ):
+    ## with a seed the run is reproducible: it seeds both the model's random module and the household size draws
+    if seed is not None:
+        random.seed(seed)
+    rng = np.random.default_rng(seed)
     store = GroceryStore(
         best_before_params={
             FoodType.PERISHABLE: (3+grocery_store_improvements, 1),
@@ -29,9 +130,10 @@ def run_simulation(where_to_save_results,
     CHILD_DAILY_CONSUMPTION = 1050
     NUMBER_OF_HOUSEHOLDS = 500
     WEEKS_TO_SIMULATE = weeks_to_simulate
-    for _ in range(NUMBER_OF_HOUSEHOLDS):
-        num_adults = random.randint(*ADULT_RANGE)
-        num_children = random.randint(*CHILD_RANGE)
+    # Draw every household's size at once (ranges are inclusive, like random.randint); tolist() gives back plain ints
+    adults_per_household = rng.integers(ADULT_RANGE[0], ADULT_RANGE[1] + 1, size=NUMBER_OF_HOUSEHOLDS).tolist()
+    children_per_household = rng.integers(CHILD_RANGE[0], CHILD_RANGE[1] + 1, size=NUMBER_OF_HOUSEHOLDS).tolist()
+    for num_adults, num_children in zip(adults_per_household, children_per_household):
 
         # Calculate the total daily consumption for perishable and non-perishable for the household
         total_perishable_consumption = ( num_adults * ADULT_DAILY_CONSUMPTION + num_children * CHILD_DAILY_CONSUMPTION) * 2
@@ -83,106 +185,115 @@ def run_simulation(where_to_save_results,
             for household in households:
                 household.daily_step()
     # print(households[0].history)
-    import pandas as pd
-    records = []
-    for idx, household in enumerate(households):
-        for day, daily_record in enumerate(household.history):
-            # Prefix each record with household_number and simulated_day
-            # Prefix each record with household_number and simulated_day
-            record = {
-                'household_number': idx,
-                'simulated_day': day,
-                'daily_consumption_leftover': daily_record['daily_consumption'][FoodType.LEFTOVER],
-                'daily_consumption_perishable': daily_record['daily_consumption'][FoodType.PERISHABLE],
-                'daily_consumption_non_perishable': daily_record['daily_consumption'][FoodType.NON_PERISHABLE],
-            }
-            # Removing meals_eaten_today as we have split it
-            daily_record_without_meals = {key: daily_record[key] for key in daily_record if key != 'daily_consumption'}
-            record.update(daily_record_without_meals)
-            records.append(record)
-    # Convert list of records to DataFrame
-    df = pd.DataFrame(records)
     # Extract the directory path from the file path.
     folder_path = os.path.dirname(where_to_save_results)
 
-    # Check if the folder exists, and if not, create it.
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
+    # Create the folder if it doesn't exist yet (other simulations running in parallel may be creating it too).
+    os.makedirs(folder_path, exist_ok=True)
+
+    write_columns(where_to_save_results, history_columns([household.history for household in households]))
 
-    df.to_csv(where_to_save_results, index=False)
+
+def _run_simulation_task(task):
+    where_to_save_results, simulation_parameters, seed = task
+    run_simulation(where_to_save_results, seed=seed, **simulation_parameters)
+    return where_to_save_results
+
+
+def run_simulations(tasks, max_workers=None, base_seed=None):
+    """
+    Run many independent simulations in parallel, one process per simulation.
+
+    Every simulation gets its own seed, spawned from base_seed: worker processes start from a copy of the parent's
+    random state, so without them every run would be the same one.
+
+    Args:
+        tasks: list of (where_to_save_results, dict of keyword arguments for run_simulation).
+        max_workers: number of processes to use (defaults to the number of CPUs).
+        base_seed: makes the whole batch reproducible (fresh entropy if None).
+    """
+    seeds = [int(seed_sequence.generate_state(1)[0])
+             for seed_sequence in np.random.SeedSequence(base_seed).spawn(len(tasks))]
+    seeded_tasks = [(where_to_save_results, simulation_parameters, seed)
+                    for (where_to_save_results, simulation_parameters), seed in zip(tasks, seeds)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for where_to_save_results in executor.map(_run_simulation_task, seeded_tasks):
+            print(f"done: {where_to_save_results}")
 
 
 ##run_simulation('../output/trial_run.csv')
 def main():
+    tasks = []
 ### initial runs (get a good handle on stuff)
     for _ in range(30):
-        run_simulation('../output/basic_runs/alwaysEatAtHome_freshFirst' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(1),
-                       meal_planning_strategy=FreshFirstStrategy())
+        tasks.append(('../output/basic_runs/alwaysEatAtHome_freshFirst' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(1),
+                           meal_planning_strategy=FreshFirstStrategy())))
 
-        run_simulation('../output/basic_runs/alwaysEatAtHome_fiftypercentperishable'+ str(_) +".csv",
-                       meal_generator = StandardMealGenerator(1),
-                       meal_planning_strategy=ProportionalConsumptionStrategy(0.5))
+        tasks.append(('../output/basic_runs/alwaysEatAtHome_fiftypercentperishable'+ str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(1),
+                           meal_planning_strategy=ProportionalConsumptionStrategy(0.5))))
 
-        run_simulation('../output/basic_runs/fiftyPercentMealsAtHome_freshFirst' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.5),
-                       meal_planning_strategy=FreshFirstStrategy())
+        tasks.append(('../output/basic_runs/fiftyPercentMealsAtHome_freshFirst' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.5),
+                           meal_planning_strategy=FreshFirstStrategy())))
 
-        run_simulation('../output/basic_runs/fiftyPercentMealsAtHome_fiftypercentperishable' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.5),
-                       meal_planning_strategy=ProportionalConsumptionStrategy(0.5))
+        tasks.append(('../output/basic_runs/fiftyPercentMealsAtHome_fiftypercentperishable' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.5),
+                           meal_planning_strategy=ProportionalConsumptionStrategy(0.5))))
 
 
     ## now do the real ones, assume that the baseline is always fresh first, 75% of meals at home
 
     for _ in range(30):
-        run_simulation('../output/runs/baseline' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy())
-
-        run_simulation('../output/runs/laxpantry' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       pantry_strategy=LaxStrategy())
-
-
-        run_simulation('../output/runs/safer_pantry' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       critical_value_order_policy=2.326)
-
-        run_simulation('../output/runs/riskier_pantry' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       critical_value_order_policy=1.64)
-
-        run_simulation('../output/runs/frequent_grocery' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       frequency_grocery_store=3)
-
-        run_simulation('../output/runs/infrequent_grocery' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       frequency_grocery_store=14)
-
-        run_simulation('../output/runs/randomfridge' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       consumption_strategy=RandomConsumptionStrategy()
-                       )
-
-        run_simulation('../output/runs/bettertechnology' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       grocery_store_improvements=1
-                       )
-        run_simulation('../output/runs/muchbettertechnology' + str(_) +".csv",
-                       meal_generator = StandardMealGenerator(0.75),
-                       meal_planning_strategy=FreshFirstStrategy(),
-                       grocery_store_improvements=2
-                       )
+        tasks.append(('../output/runs/baseline' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy())))
+
+        tasks.append(('../output/runs/laxpantry' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           pantry_strategy=LaxStrategy())))
+
+
+        tasks.append(('../output/runs/safer_pantry' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           critical_value_order_policy=2.326)))
+
+        tasks.append(('../output/runs/riskier_pantry' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           critical_value_order_policy=1.64)))
+
+        tasks.append(('../output/runs/frequent_grocery' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           frequency_grocery_store=3)))
+
+        tasks.append(('../output/runs/infrequent_grocery' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           frequency_grocery_store=14)))
+
+        tasks.append(('../output/runs/randomfridge' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           consumption_strategy=RandomConsumptionStrategy()
+                           )))
+
+        tasks.append(('../output/runs/bettertechnology' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           grocery_store_improvements=1
+                           )))
+        tasks.append(('../output/runs/muchbettertechnology' + str(_) +".csv", dict(
+                           meal_generator = StandardMealGenerator(0.75),
+                           meal_planning_strategy=FreshFirstStrategy(),
+                           grocery_store_improvements=2
+                           )))
 
+    run_simulations(tasks)
 
 
 if __name__ == "__main__":
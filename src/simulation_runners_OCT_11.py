@@ -1,31 +1,69 @@
-from simulation_runners import run_simulation
+## Profiling (python simulation_runners_OCT_11.py --profile, on the noiseandguests scenario) points at the
+## per-household daily loop: Household.daily_step -> Meal.consume -> BasicConsumptionStrategy.select_food /
+## Pantry.consume_item, then Pantry.step. Next come FreshFirstStrategy.plan_meal and the weekly plans
+## (VariableMealGenerator's gauss draws), then GroceryStore.get_order.
+## Pantry buckets hold a handful of items, so the time is spent in Python calls and attribute lookups, not in
+## moving memory around: trimming work per call (or compiling the loop) pays, vectorising it does not.
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+
+from simulation_runners import run_simulation, run_simulations
 from simulation import *
 
-for _ in range(30):
-    # run_simulation('../output/runs_oct11/baseline' + str(_) + ".csv",
-    #                meal_generator=StandardMealGenerator(0.75),
-    #                meal_planning_strategy=FreshFirstStrategy())
-    # ## guests....
-    # run_simulation('../output/runs_oct11/guests' + str(_) + ".csv",
-    #                meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
-    #                                                     0,
-    #                                                     .25,
-    #                                                     3),
-    #                meal_planning_strategy=FreshFirstStrategy())
-    # run_simulation('../output/runs_oct11/noise' + str(_) + ".csv",
-    #                meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
-    #                                                     .15,
-    #                                                     0,
-    #                                                     3),
-    #                meal_planning_strategy=FreshFirstStrategy())
-    run_simulation('../output/runs_oct11/noiseandguests' + str(_) + ".csv",
-                   meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
-                                                        .15,
-                                                        .25,
-                                                        3),
-                   meal_planning_strategy=FreshFirstStrategy())
-    # ## 5% leftovers
-    # run_simulation('../output/runs_oct11/leftovers' + str(_) + ".csv",
-    #                meal_generator=StandardMealGenerator(0.75),
-    #                meal_planning_strategy=FreshFirstStrategy(),
-    #                leftover_generator=FixedPercentageLeftoverGenerator(0.05))
+## fixed seed for --profile runs
+PROFILE_SEED = 0
+
+
+def main():
+    ## every run is independent (own output file): queue them all up, then run them in parallel
+    tasks = []
+    for _ in range(30):
+        # tasks.append(('../output/runs_oct11/baseline' + str(_) + ".parquet", dict(
+        #                meal_generator=StandardMealGenerator(0.75),
+        #                meal_planning_strategy=FreshFirstStrategy())))
+        # ## guests....
+        # tasks.append(('../output/runs_oct11/guests' + str(_) + ".parquet", dict(
+        #                meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
+        #                                                     0,
+        #                                                     .25,
+        #                                                     3),
+        #                meal_planning_strategy=FreshFirstStrategy())))
+        # tasks.append(('../output/runs_oct11/noise' + str(_) + ".parquet", dict(
+        #                meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
+        #                                                     .15,
+        #                                                     0,
+        #                                                     3),
+        #                meal_planning_strategy=FreshFirstStrategy())))
+        tasks.append(('../output/runs_oct11/noiseandguests' + str(_) + ".parquet", dict(
+                       meal_generator=VariableMealGenerator(StandardMealGenerator(0.75),
+                                                            .15,
+                                                            .25,
+                                                            3),
+                       meal_planning_strategy=FreshFirstStrategy())))
+        # ## 5% leftovers
+        # tasks.append(('../output/runs_oct11/leftovers' + str(_) + ".parquet", dict(
+        #                meal_generator=StandardMealGenerator(0.75),
+        #                meal_planning_strategy=FreshFirstStrategy(),
+        #                leftover_generator=FixedPercentageLeftoverGenerator(0.05))))
+
+    if "--profile" in sys.argv:
+        ## run only the first scenario, in this process, under the profiler: seeded so profiles can be compared,
+        ## and saved to a scratch file so it never overwrites a real result
+        where_to_save_results, params = tasks[0]
+        profiler = cProfile.Profile()
+        with tempfile.TemporaryDirectory() as scratch_folder:
+            scratch_results = os.path.join(scratch_folder, os.path.basename(where_to_save_results))
+            profiler.runcall(run_simulation, scratch_results, seed=PROFILE_SEED, **params)
+        profiler.dump_stats("profile.prof")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        return
+
+    run_simulations(tasks)
+
+
+## worker processes import this module too: only the parent should queue up the runs
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,12 @@
 # (5) what if people want more perishables in their lives? ---> seasonal shock?
 # (6) What if we manage to push perishables to last one more day on average?
 import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from simulation import *
+from simulation_runners import history_columns, write_columns
 
-random.seed(0)
+SEED = 0
 
 store = GroceryStore(
     best_before_params={
@@ -23,7 +26,6 @@ store = GroceryStore(
         FoodType.NON_PERISHABLE: (100, 20),
     }
 )
-households = []
 
 ADULT_RANGE = (1, 5)  # Assuming a household can have between 1 to 5 adults
 CHILD_RANGE = (0, 5)  # Assuming a household can have between 0 to 5 children
@@ -35,10 +37,20 @@ NUMBER_OF_HOUSEHOLDS = 500
 WEEKS_TO_SIMULATE = 20
 
 
+def simulate_household(household_params):
+    """
+    Build one household and run it through the whole simulation; households don't interact, so each can run
+    in its own process.
 
-for _ in range(NUMBER_OF_HOUSEHOLDS):
-    num_adults = random.randint(*ADULT_RANGE)
-    num_children = random.randint(*CHILD_RANGE)
+    Args:
+        household_params: (seed, number of adults, number of children). The seed makes every household's
+                          timeline reproducible no matter which process runs it.
+
+    Returns:
+        The household's daily history.
+    """
+    seed, num_adults, num_children = household_params
+    random.seed(seed)
 
     # Calculate the total daily consumption for perishable and non-perishable for the household
     total_perishable_consumption = (num_adults * ADULT_DAILY_CONSUMPTION + num_children * CHILD_DAILY_CONSUMPTION) * 2
@@ -76,45 +88,34 @@ for _ in range(NUMBER_OF_HOUSEHOLDS):
     household.pantry.add_item(
         FoodItem("temp", FoodType.NON_PERISHABLE, 6, 6, total_perishable_consumption * 10)
     )
-    households.append(
-        household
-
-
-    )
 
-for week in range(WEEKS_TO_SIMULATE):
-    print(f"week: {week}")
-    for household in households:
+    for week in range(WEEKS_TO_SIMULATE):
         household.start_of_week()
-    for day in range(7):
-        for household in households:
+        for day in range(7):
             household.daily_step()
 
+    return household.history
 
 
-#print(households[0].history)
+def main():
+    ## draw every household's size (and its own seed) up front, in the parent; ranges are inclusive
+    rng = np.random.default_rng(SEED)
+    adults_per_household = rng.integers(ADULT_RANGE[0], ADULT_RANGE[1] + 1, size=NUMBER_OF_HOUSEHOLDS).tolist()
+    children_per_household = rng.integers(CHILD_RANGE[0], CHILD_RANGE[1] + 1, size=NUMBER_OF_HOUSEHOLDS).tolist()
+    ## independent seeds, one per household, all derived from SEED
+    household_seeds = [int(seed_sequence.generate_state(1)[0])
+                       for seed_sequence in np.random.SeedSequence(SEED).spawn(NUMBER_OF_HOUSEHOLDS)]
+    households_params = list(zip(household_seeds, adults_per_household, children_per_household))
 
-import pandas as pd
+    with ProcessPoolExecutor() as executor:
+        histories = list(executor.map(simulate_household, households_params, chunksize=25))
 
-records = []
+    #print(histories[0])
 
-for idx, household in enumerate(households):
-    for day, daily_record in enumerate(household.history):
-        # Prefix each record with household_number and simulated_day
-        # Prefix each record with household_number and simulated_day
-        record = {
-            'household_number': idx,
-            'simulated_day': day,
-            'daily_consumption_leftover': daily_record['daily_consumption'][FoodType.LEFTOVER],
-            'daily_consumption_perishable': daily_record['daily_consumption'][FoodType.PERISHABLE],
-            'daily_consumption_non_perishable': daily_record['daily_consumption'][FoodType.NON_PERISHABLE],
-        }
-        # Removing meals_eaten_today as we have split it
-        daily_record_without_meals = {key: daily_record[key] for key in daily_record if key != 'daily_consumption'}
-        record.update(daily_record_without_meals)
-        records.append(record)
+    # Parquet rather than CSV: much faster to write and read back, and a fraction of the size
+    write_columns('simulation_results.parquet', history_columns(histories))
 
-# Convert list of records to DataFrame
-df = pd.DataFrame(records)
 
-df.to_csv('simulation_results.csv', index=False)
+## worker processes import this module too: only the parent should run the simulation
+if __name__ == "__main__":
+    main()
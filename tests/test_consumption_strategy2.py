@@ -1,6 +1,6 @@
 import unittest
 
-from simulation import FoodType, Pantry, FoodItem, RandomConsumptionStrategy, Meal
+from simulation import FoodType, Pantry, FoodItem, RandomConsumptionStrategy, Meal, LaxStrategy
 
 
 class TestRandomization(unittest.TestCase):
@@ -14,9 +14,8 @@ class TestRandomization(unittest.TestCase):
         self.rice_medium = FoodItem("Medium Rice", FoodType.NON_PERISHABLE, 365, 730, 1.0)
         self.rice_large = FoodItem("Large Rice", FoodType.NON_PERISHABLE, 365, 730, 1.5)
 
-        self.rice_small.original_quantity=self.rice_small.quantity
-        self.rice_medium.original_quantity=self.rice_medium.quantity
-        self.rice_large.original_quantity=self.rice_large.quantity
+        self.original_quantities = {rice: rice.quantity for rice in
+                                    [self.rice_small, self.rice_medium, self.rice_large]}
 
         # Toss 'em in.
         self.pantry.add_item(self.rice_small)
@@ -42,7 +41,7 @@ class TestRandomization(unittest.TestCase):
 
             # Reset the pantry to its original state for the next loop.
             for food in [self.rice_small, self.rice_medium, self.rice_large]:
-                food.quantity = food.original_quantity
+                food.quantity = self.original_quantities[food]
 
         # Now let's check if each type of rice was picked a reasonable number of times.
         # If one rice type is overwhelmingly chosen, we'd suspect it ain't random.
@@ -61,3 +60,21 @@ class TestRandomization(unittest.TestCase):
         foods_eaten = [d[0] for d in foods_eaten]
         self.assertTrue(self.rice_small in foods_eaten)
 
+    def test_eating_everything_leaves_pantry_to_clean_up(self):
+        """Eating all the rice shouldn't pull the bags out of the pantry behind its back."""
+        strategy = RandomConsumptionStrategy()
+        meal = Meal(self.pantry)
+        meal.set_consumption_patterns({FoodType.NON_PERISHABLE: 5.0})
+        foods_eaten = meal.consume(strategy)
+
+        # Each bag is eaten exactly once, plus the takeout to cover what's missing.
+        eaten_rice = [d[0] for d in foods_eaten if d[0].name != "Emergency Takeout"]
+        self.assertEqual(len(eaten_rice), 3)
+        self.assertEqual(len(set(eaten_rice)), 3)
+
+        # The empty bags are still there (with nothing in them) until the pantry steps.
+        self.assertEqual(len(self.pantry.get_items_by_type(FoodType.NON_PERISHABLE)), 3)
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.NON_PERISHABLE), 0)
+        self.pantry.step(LaxStrategy())
+        self.assertEqual(len(self.pantry.get_items_by_type(FoodType.NON_PERISHABLE)), 0)
+
@@ -1,8 +1,12 @@
+import os
 import unittest
 
 from simulation import StandardMealGenerator, ProportionalConsumptionStrategy, FoodType, FoodItem, Household, \
     FixedConsumptionPolicy
 
+## the pantry levels below are only printed on request: VERBOSE_TESTS=1
+VERBOSE = bool(os.environ.get("VERBOSE_TESTS"))
+
 
 class TestHousehold(unittest.TestCase):
 
@@ -25,7 +29,8 @@ class TestHousehold(unittest.TestCase):
 
     def test_multiple_days(self):
         days_simulated = 0
-        print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
+        if VERBOSE:
+            print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
 
         # Simulate days until the perishables expire
         while True :
@@ -38,7 +43,8 @@ class TestHousehold(unittest.TestCase):
 
             # For this simple test, we're not checking consumption amounts on each day
             # but you can add more detailed assertions if necessary.
-            print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
+            if VERBOSE:
+                print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
 
             # Ensure there is more than 0 left...
             self.assertGreater(self.household.pantry.get_total_by_type(FoodType.PERISHABLE), 0)
@@ -49,11 +55,14 @@ class TestHousehold(unittest.TestCase):
 
         # Depending on the consumption rate and meal patterns, you might want to check
         # the remaining quantities of perishables and non-perishables
-        print("Days simulated:", days_simulated)
+        if VERBOSE:
+            print("Days simulated:", days_simulated)
         self.assertTrue(days_simulated==5)
-        print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
+        if VERBOSE:
+            print("Perishables remaining:", self.household.pantry.get_total_by_type(FoodType.PERISHABLE))
         self.assertEqual(self.household.pantry.get_total_by_type(FoodType.PERISHABLE), 0)
-        print("Non-perishables remaining:", self.household.pantry.get_total_by_type(FoodType.NON_PERISHABLE))
+        if VERBOSE:
+            print("Non-perishables remaining:", self.household.pantry.get_total_by_type(FoodType.NON_PERISHABLE))
         self.assertGreater(self.household.pantry.get_total_by_type(FoodType.NON_PERISHABLE), 0)
 
 
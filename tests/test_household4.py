@@ -41,18 +41,18 @@ class TestHouseholdOrderAndConsume(unittest.TestCase):
 
 
         ## you will have consumed only emergency takeouts....
-        total_consumed = sum([day["emergency_takeouts"] for day in self.household.history])
+        total_consumed = sum(day["emergency_takeouts"] for day in self.household.history)
         self.assertAlmostEqual(total_consumed, 7 * 1600, delta=0.1)
 
         ## but if I step it again for 6 days, I should be able to eat more real food...
         self.household.start_of_week()
         for _ in range(7):
             self.household.daily_step()
-        total_consumed = sum([day["emergency_takeouts"] for day in self.household.history[7:]])
+        total_consumed = sum(day["emergency_takeouts"] for day in self.household.history[7:])
         self.assertAlmostEqual(total_consumed, 0, delta=0.1)
 
         # Check if the total food consumed in the week is approximately equal to 7 * 1800g
-        total_consumed = sum([day["daily_consumption"][FoodType.PERISHABLE] for day in self.household.history[7:]])
+        total_consumed = sum(day["daily_consumption"][FoodType.PERISHABLE] for day in self.household.history[7:])
         self.assertAlmostEqual(total_consumed, 7 * 1600, delta=0.1)
 
     def tearDown(self):
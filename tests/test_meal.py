@@ -58,8 +58,8 @@ class TestMeal(unittest.TestCase):
         # We said we're gonna eat 1kg of leftovers, and we only have 0.25kg pizza.
         # So, after the meal, there should be no pizza left in the pantry.
         self.pantry.step(StrictStrategy())
-        leftovers_in_pantry = any(item.food_type == FoodType.LEFTOVER for item in self.pantry.items_by_type[FoodType.LEFTOVER])
-        self.assertFalse(leftovers_in_pantry)
+        self.assertFalse(self.pantry.items_by_type[FoodType.LEFTOVER])
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.LEFTOVER), 0)
 
 
 if __name__ == "__main__":
@@ -45,3 +45,15 @@ class TestStandardMealGenerator(unittest.TestCase):
         # Assuming meals are never at home for low ratio
         for day_meals in weekly_meals_low_ratio:
             self.assertEqual(len(day_meals), 0)  # No meals at home
+
+    def test_shared_generator_sizes_meals_per_household(self):
+        """One generator serving households of different sizes should plan meals for each of them properly."""
+        generator = StandardMealGenerator(meals_at_home_ratio=1)
+        small_household = Household(adults=1, children=0, income_percentile=1)
+
+        for _ in range(2):  # The second round is served from what the generator remembered.
+            small_breakfast = generator.generate_weekly_meals(small_household)[0][0]
+            family_breakfast = generator.generate_weekly_meals(self.household)[0][0]
+            self.assertEqual(small_breakfast.total_grams, 400)  # 1 adult
+            self.assertEqual(family_breakfast.total_grams, 2 * 400 + 2 * 250)  # 2 adults, 2 kids
+            self.assertIsNot(small_breakfast, generator.generate_weekly_meals(small_household)[0][0])
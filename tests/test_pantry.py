@@ -95,6 +95,61 @@ class TestPantry(unittest.TestCase):
         self.assertEqual(self.pantry.get_total_by_type(FoodType.LEFTOVER), 0)
         self.assertEqual(self.pantry.get_total(), 0)
 
+    def test_totals_follow_additions_consumption_and_discards(self):
+        ## The per-type totals are kept up to date rather than recomputed, so check them through a whole cycle:
+        # adding food, eating some of it and throwing some of it away.
+        item1 = FoodItem("PerishableItem6", FoodType.PERISHABLE, 1, 5, 1.0)
+        item2 = FoodItem("PerishableItem7", FoodType.PERISHABLE, 3, 5, 2.0)
+        item3 = FoodItem("NonPerishableItem1", FoodType.NON_PERISHABLE, 100, 200, 4.0)
+        self.pantry.add_item(item1)
+        self.pantry.add_item(item2)
+        self.pantry.add_item(item3)
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.PERISHABLE), 3.0)
+        self.assertEqual(self.pantry.get_total(), 7.0)
+
+        self.pantry.consume_item(item3, 1.5)
+        self.assertEqual(item3.quantity, 2.5)
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.NON_PERISHABLE), 2.5)
+
+        # item1 is now past its best before date: the strict strategy throws it away.
+        self.pantry.step(StrictStrategy())
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.PERISHABLE), 2.0)
+        self.assertEqual(self.pantry.get_total(), 4.5)
+        self.assertEqual(self.pantry.today_strategy_total, 1.0)
+        self.assertEqual(self.pantry.today_expired_total, 0)
+
+    def test_add_items_matches_adding_one_at_a_time(self):
+        ## Adding a whole order at once should leave the pantry exactly as adding each item in turn:
+        # same totals, and items sorted by spoilage date with ties kept in arrival order.
+        def order():
+            return [FoodItem("Milk", FoodType.PERISHABLE, 2, 4, 1.0),
+                    FoodItem("Bread", FoodType.PERISHABLE, 1, 2, 0.5),
+                    FoodItem("Cheese", FoodType.PERISHABLE, 3, 4, 0.25),
+                    FoodItem("Rice", FoodType.NON_PERISHABLE, 100, 200, 2.0)]
+
+        one_at_a_time = Pantry()
+        one_at_a_time.add_item(FoodItem("Yogurt", FoodType.PERISHABLE, 3, 4, 0.5))
+        for item in order():
+            one_at_a_time.add_item(item)
+        self.pantry.add_item(FoodItem("Yogurt", FoodType.PERISHABLE, 3, 4, 0.5))
+        self.pantry.add_items(order())
+
+        for food_type in FoodType:
+            self.assertEqual([item.name for item in self.pantry.get_items_by_type(food_type)],
+                             [item.name for item in one_at_a_time.get_items_by_type(food_type)])
+            self.assertEqual(self.pantry.get_total_by_type(food_type), one_at_a_time.get_total_by_type(food_type))
+
+    def test_eating_everything_leaves_no_rounding_residue(self):
+        ## Taking 0.1, 0.2 and 0.3 off a running total of 0.6 leaves about 1e-16 behind: the pantry must still
+        # report exactly nothing left, or the next meal would plan (and miss) that phantom amount.
+        items = [FoodItem("Leftover" + str(i), FoodType.LEFTOVER, 2, 2, quantity) for i, quantity in
+                 enumerate([0.1, 0.2, 0.3])]
+        for item in items:
+            self.pantry.add_item(item)
+        for item in items:
+            self.pantry.consume_item(item, item.quantity)
+        self.assertEqual(self.pantry.get_total_by_type(FoodType.LEFTOVER), 0)
+        self.assertEqual(self.pantry.get_total(), 0)
 
 
 if __name__ == '__main__':